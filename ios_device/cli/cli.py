@@ -1,3 +1,4 @@
+import collections.abc
 import json
 from pprint import pprint
 
@@ -11,6 +12,8 @@ class Enconding(json.JSONEncoder):
                 return o.decode()
             except:
                 return str(o)
+        if isinstance(o, collections.abc.Mapping):
+            return dict(o)
 
 
 def print_json(buf, format=True):
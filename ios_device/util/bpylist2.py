@@ -1,4 +1,4 @@
-import copy
+import collections.abc
 import sys
 from typing import Mapping, Dict
 import uuid
@@ -7,7 +7,7 @@ from datetime import datetime, timezone
 from typing import Optional
 from . import plistlib
 
-import dataclasses
+from dataclasses import dataclass as _dataclass, fields as _fields
 
 
 class Error(Exception):
@@ -16,25 +16,64 @@ class Error(Exception):
 
 _IGNORE_UNMAPPED_KEY = "__bpylist_ignore_unmapped__"
 
+# Archive keys which are not identifiers and so not interned by the compiler
+_NS_TIME = sys.intern('NS.time')
+_NS_BASE = sys.intern('NS.base')
+_NS_RELATIVE = sys.intern('NS.relative')
+_NS_UUIDBYTES = sys.intern('NS.uuidbytes')
+_NS_KEYS = sys.intern('NS.keys')
+_NS_OBJECTS = sys.intern('NS.objects')
+_NS_DATA = sys.intern('NS.data')
+_NS_STRING = sys.intern('NS.string')
+_NS_NAME = sys.intern('NS.name')
+_NS_REASON = sys.intern('NS.reason')
+_DOLLAR_CLASS = sys.intern('$class')
+_DOLLAR_CLASSNAME = sys.intern('$classname')
+_DOLLAR_CLASSES = sys.intern('$classes')
+
 
 def _verify_dataclass_has_fields(dataclass, plist_obj):
     if getattr(dataclass, _IGNORE_UNMAPPED_KEY, False):
         return
 
-    dataclass_fields = dataclasses.fields(dataclass)
-
-    skip_fields = {'$class'}
-
-    fields_to_verify = plist_obj.keys() - skip_fields
-    fields_with_no_dots = {
-        (f if not f.startswith('NS.') else 'NS' + f[3:])
-        for f in fields_to_verify}
-    unmapped_fields = fields_with_no_dots - {f.name for f in dataclass_fields}
+    valid_keys = dataclass._archive_valid_keys
+    unmapped_fields = [k for k in plist_obj if k not in valid_keys]
     if unmapped_fields:
         raise Error(
             f"Unmapped fields: {unmapped_fields} for class {dataclass}")
 
 
+def _archive_field_name(name):
+    "NSfoo fields are archived under the NS.foo key"
+    if name.startswith('NS'):
+        name = 'NS.' + name[2:]
+    return sys.intern(name)
+
+
+class _LazyArchiveFields:
+    """
+    Placeholder installed on every DataclassArchiver subclass.
+
+    __init_subclass__ runs before the @dataclass decorator, so the fields are
+    not known yet; on first access the real values are computed and stored
+    on the class, replacing this descriptor.
+    """
+
+    def __init__(self, name):
+        self._name = name
+
+    def __get__(self, obj, owner):
+        dataclass_fields = _fields(owner)
+        owner._archive_field_map = tuple(
+            (f.name, _archive_field_name(f.name)) for f in dataclass_fields)
+        # both the NS.foo archive key and the plain NSfoo field name are
+        # accepted for an NSfoo field
+        owner._archive_valid_keys = frozenset(
+            [name for pair in owner._archive_field_map for name in pair]
+            + [_DOLLAR_CLASS])
+        return owner.__dict__[self._name]
+
+
 class DataclassArchiver:
     """Helper to easily map python dataclasses (PEP557) to archived objects.
 
@@ -64,27 +103,26 @@ class DataclassArchiver:
     """
     def __init_subclass__(cls, ignore_unmapped=False):
         setattr(cls, _IGNORE_UNMAPPED_KEY, ignore_unmapped)
+        cls._archive_field_map = _LazyArchiveFields('_archive_field_map')
+        cls._archive_valid_keys = _LazyArchiveFields('_archive_valid_keys')
 
     @staticmethod
     def encode_archive(obj, archive):
-        for field in dataclasses.fields(type(obj)):
-            archive_field_name = field.name
-            if archive_field_name[:2] == 'NS':
-                archive_field_name = 'NS.' + archive_field_name[2:]
-            archive.encode(archive_field_name, getattr(obj, field.name))
+        encode = archive.encode
+        for attr, key in type(obj)._archive_field_map:
+            encode(key, getattr(obj, attr))
 
     @classmethod
-    def decode_archive(cls, archive):
+    def decode_archive(cls, archive, _bytearray=bytearray, _bytes=bytes):
         _verify_dataclass_has_fields(cls, archive.object)
         field_values = {}
-        for field in dataclasses.fields(cls):
-            archive_field_name = field.name
-            if archive_field_name[:2] == 'NS':
-                archive_field_name = 'NS.' + archive_field_name[2:]
-            value = archive.decode(archive_field_name)
-            if isinstance(value, bytearray):
-                value = bytes(value)
-            field_values[field.name] = value
+        decode = archive.decode
+        for attr, key in cls._archive_field_map:
+            value = decode(key)
+            # decoded values are never bytearray subclasses, skip the MRO walk
+            if type(value) is _bytearray:
+                value = _bytes(value)
+            field_values[attr] = value
         return cls(**field_values)
 
 
@@ -111,40 +149,52 @@ class timestamp(float):
     unix2apple_epoch_delta = 978307200.0
 
     @staticmethod
-    def encode_archive(obj, archive):
+    def encode_archive(obj, archive, _delta=unix2apple_epoch_delta):
         "Delegate for packing timestamps back into the NSDate archive format"
-        offset = obj - timestamp.unix2apple_epoch_delta
-        archive.encode('NS.time', offset)
+        archive.encode(_NS_TIME, obj - _delta)
 
-    @staticmethod
-    def decode_archive(archive):
+    @classmethod
+    def decode_archive(cls, archive, _delta=unix2apple_epoch_delta):
         "Delegate for unpacking NSDate objects from an archiver.Archive"
-        offset = archive.decode('NS.time')
-        return timestamp(timestamp.unix2apple_epoch_delta + offset)
+        return cls(_delta + archive.decode(_NS_TIME))
 
-    def __str__(self):
-        return f"bpylist.timestamp {self.to_datetime().__repr__()}"
+    def __str__(self, _repr=repr):
+        return f"bpylist.timestamp {_repr(self.to_datetime())}"
+
+    def to_datetime(self, _fromts=datetime.fromtimestamp,
+                    _utc=timezone.utc) -> datetime:
+        return _fromts(self, _utc)
 
-    def to_datetime(self) -> datetime:
-        return datetime.fromtimestamp(self, timezone.utc)
 
+class NSMutableData:
+    "Delegate for packing/unpacking NSMutableData objects into a bytes holder"
+    __slots__ = ('NSdata',)
+    # checked by _verify_dataclass_has_fields like a DataclassArchiver's keys
+    _archive_valid_keys = frozenset((_DOLLAR_CLASS, _NS_DATA, 'NSdata'))
 
-@dataclasses.dataclass()
-class NSMutableData(DataclassArchiver):
-    NSdata: Optional[bytes] = None
+    def __init__(self, NSdata: Optional[bytes] = None):
+        self.NSdata = NSdata
 
     def __repr__(self):
         return "NSMutableData(%s bytes)" % (
             'null' if self.NSdata is None else len(self.NSdata))
 
+    def __eq__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self.NSdata == other.NSdata
 
-@dataclasses.dataclass()
-class NSMutableData(DataclassArchiver):
-    NSdata: Optional[bytes] = None
+    @staticmethod
+    def encode_archive(obj, archive):
+        archive.encode(_NS_DATA, obj.NSdata)
 
-    def __repr__(self):
-        return "NSMutableData(%s bytes)" % (
-            'null' if self.NSdata is None else len(self.NSdata))
+    @classmethod
+    def decode_archive(cls, archive, _bytearray=bytearray, _bytes=bytes):
+        _verify_dataclass_has_fields(cls, archive.object)
+        value = archive.decode(_NS_DATA)
+        if type(value) is _bytearray:
+            value = _bytes(value)
+        return cls(value)
 
 
 # The magic number which Cocoa uses as an implementation version.
@@ -236,8 +286,8 @@ class DictArchive:
 
     @staticmethod
     def decode_archive(archive_obj):
-        key_uids = archive_obj.decode('NS.keys')
-        val_uids = archive_obj.decode('NS.objects')
+        key_uids = archive_obj.decode(_NS_KEYS)
+        val_uids = archive_obj.decode(_NS_OBJECTS)
 
         count = len(key_uids)
         d = dict()
@@ -255,7 +305,7 @@ class ListArchive:
 
     @staticmethod
     def decode_archive(archive_obj):
-        uids = archive_obj.decode('NS.objects')
+        uids = archive_obj.decode(_NS_OBJECTS)
         return [archive_obj.decode_index(index) for index in uids]
 
 
@@ -264,7 +314,7 @@ class SetArchive:
 
     @staticmethod
     def decode_archive(archive_obj):
-        uids = archive_obj.decode('NS.objects')
+        uids = archive_obj.decode(_NS_OBJECTS)
         return {archive_obj.decode_index(index) for index in uids}
 
 
@@ -348,7 +398,7 @@ class Unarchive:
         if not isinstance(meta, dict):
             raise MissingClassMetaData(index, meta)
 
-        name = meta.get('$classname')
+        name = meta.get(_DOLLAR_CLASSNAME)
         if not isinstance(name, str):
             raise MissingClassName(meta)
 
@@ -388,7 +438,7 @@ class Unarchive:
             self.unpacked_uids[index] = obj
             return raw_obj
 
-        class_uid = raw_obj.get('$class')
+        class_uid = raw_obj.get(_DOLLAR_CLASS)
         if class_uid is None:
             raise MissingClassUID(raw_obj)
 
@@ -474,8 +524,8 @@ class Archive:
         # TODO: this is where we might need to include the full class ancestry;
         #       though the open source code from apple does not appear to check
         self.objects.append({
-            '$classes': [archiver],
-            '$classname': archiver
+            _DOLLAR_CLASSES: [archiver],
+            _DOLLAR_CLASSNAME: archiver
         })
 
         return val
@@ -490,17 +540,17 @@ class Archive:
 
     def encode_list(self, objs, archive_obj):
         archiver_uid = self.uid_for_archiver('NSArray')
-        archive_obj['$class'] = archiver_uid
-        archive_obj['NS.objects'] = [self.archive(obj) for obj in objs]
+        archive_obj[_DOLLAR_CLASS] = archiver_uid
+        archive_obj[_NS_OBJECTS] = [self.archive(obj) for obj in objs]
 
     def encode_set(self, objs, archive_obj):
         archiver_uid = self.uid_for_archiver('NSSet')
-        archive_obj['$class'] = archiver_uid
-        archive_obj['NS.objects'] = [self.archive(obj) for obj in objs]
+        archive_obj[_DOLLAR_CLASS] = archiver_uid
+        archive_obj[_NS_OBJECTS] = [self.archive(obj) for obj in objs]
 
     def encode_dict(self, obj, archive_obj):
         archiver_uid = self.uid_for_archiver('NSDictionary')
-        archive_obj['$class'] = archiver_uid
+        archive_obj[_DOLLAR_CLASS] = archiver_uid
 
         keys = []
         vals = []
@@ -508,8 +558,8 @@ class Archive:
             keys.append(self.archive(k))
             vals.append(self.archive(obj[k]))
 
-        archive_obj['NS.keys'] = keys
-        archive_obj['NS.objects'] = vals
+        archive_obj[_NS_KEYS] = keys
+        archive_obj[_NS_OBJECTS] = vals
 
     def encode_top_level(self, obj, archive_obj):
         "Encode obj and store the encoding in archive_obj"
@@ -531,7 +581,7 @@ class Archive:
                 raise MissingClassMapping(obj, ARCHIVE_CLASS_MAP)
 
             archiver_uid = self.uid_for_archiver(archiver)
-            archive_obj['$class'] = archiver_uid
+            archive_obj[_DOLLAR_CLASS] = archiver_uid
 
             archive_wrapper = ArchivingObject(archive_obj, self)
             cls.encode_archive(obj, archive_wrapper)
@@ -610,21 +660,26 @@ class ErrorArchive:
 class ExceptionArchive:
 
     def decode_archive(archive):
-        name = archive.decode('NS.name')
-        reason = archive.decode('NS.reason')
+        name = archive.decode(_NS_NAME)
+        reason = archive.decode(_NS_REASON)
         userinfo = archive.decode('userinfo')
         return {"$class": "NSException", "reason": reason, "userinfo": userinfo, "name": name}
 
 
 class NSURL:
     "Delegate for packing/unpacking Url"
+    __slots__ = ('_base', '_relative')
 
     def __init__(self, base, relative):
         self._base = base
         self._relative = relative
 
     def __eq__(self, other) -> bool:
-        return self._base == other._base and self._relative == other._relative
+        return self is other or (
+            self._base == other._base and self._relative == other._relative)
+
+    def __hash__(self):
+        return hash((self._base, self._relative))
 
     def __str__(self):
         return "NSURL({}, {})".format(self._base, self._relative)
@@ -634,59 +689,74 @@ class NSURL:
 
     def encode_archive(obj, archive):
         "Delegate for packing timestamps back into the NSDate archive format"
-        archive.encode('NS.base', obj._base)
-        archive.encode('NS.relative', obj._relative)
+        archive.encode(_NS_BASE, obj._base)
+        archive.encode(_NS_RELATIVE, obj._relative)
 
     def decode_archive(obj, archive):
-        base = archive.decode('NS.base')
-        relative = archive.decode('NS.relative')
+        base = archive.decode(_NS_BASE)
+        relative = archive.decode(_NS_RELATIVE)
         return {"$class": "NSURL", "base": base, "relative": relative}
 
 
-class XCTestConfiguration:
-    _default = {
-        'aggregateStatisticsBeforeCrash': {
-            'XCSuiteRecordsKey': {}
-        },
-        'automationFrameworkPath': '/Developer/Library/PrivateFrameworks/XCTAutomationSupport.framework',
-        'baselineFileRelativePath': None,
-        'baselineFileURL': None,
-        'defaultTestExecutionTimeAllowance': None,
-        'disablePerformanceMetrics': False,
-        'emitOSLogs': False,
-        'formatVersion': 2,  # store in UID
-        'gatherLocalizableStringsData': False,
-        'initializeForUITesting': True,
-        'maximumTestExecutionTimeAllowance': None,
-        'productModuleName': "WebDriverAgentRunner",  # set to other value is also OK
-        'randomExecutionOrderingSeed': None,
-        'reportActivities': True,
-        'reportResultsToIDE': True,
-        'systemAttachmentLifetime': 2,
-        'targetApplicationArguments': [],  # maybe useless
-        'targetApplicationBundleID': None,
-        'targetApplicationEnvironment': None,
-        'targetApplicationPath': None,
-        'testApplicationDependencies': {},
-        'testApplicationUserOverrides': None,
-        'testBundleRelativePath': None,
-        'testExecutionOrdering': 0,
-        'testTimeoutsEnabled': False,
-        'testsDrivenByIDE': False,
-        'testsMustRunOnMainThread': True,
-        'testsToRun': None,
-        'testsToSkip': None,
-        'treatMissingBaselinesAsFailures': False,
-        'userAttachmentLifetime': 1
-    }
+# Default XCTestConfiguration values; _clone_default() rebuilds the containers
+_XCTC_TEMPLATE = {
+    'aggregateStatisticsBeforeCrash': {
+        'XCSuiteRecordsKey': {}
+    },
+    'automationFrameworkPath': '/Developer/Library/PrivateFrameworks/XCTAutomationSupport.framework',
+    'baselineFileRelativePath': None,
+    'baselineFileURL': None,
+    'defaultTestExecutionTimeAllowance': None,
+    'disablePerformanceMetrics': False,
+    'emitOSLogs': False,
+    'formatVersion': 2,  # store in UID
+    'gatherLocalizableStringsData': False,
+    'initializeForUITesting': True,
+    'maximumTestExecutionTimeAllowance': None,
+    'productModuleName': "WebDriverAgentRunner",  # set to other value is also OK
+    'randomExecutionOrderingSeed': None,
+    'reportActivities': True,
+    'reportResultsToIDE': True,
+    'systemAttachmentLifetime': 2,
+    'targetApplicationArguments': [],  # maybe useless
+    'targetApplicationBundleID': None,
+    'targetApplicationEnvironment': None,
+    'targetApplicationPath': None,
+    'testApplicationDependencies': {},
+    'testApplicationUserOverrides': None,
+    'testBundleRelativePath': None,
+    'testExecutionOrdering': 0,
+    'testTimeoutsEnabled': False,
+    'testsDrivenByIDE': False,
+    'testsMustRunOnMainThread': True,
+    'testsToRun': None,
+    'testsToSkip': None,
+    'treatMissingBaselinesAsFailures': False,
+    'userAttachmentLifetime': 1
+}
+_XCTC_MUTABLE_KEYS = ('aggregateStatisticsBeforeCrash', 'targetApplicationArguments',
+                      'testApplicationDependencies')
+assert _XCTC_MUTABLE_KEYS == tuple(
+    k for k, v in _XCTC_TEMPLATE.items() if type(v) in (dict, list))
+
 
+def _clone_default():
+    "copy.deepcopy(_XCTC_TEMPLATE) unrolled for its _XCTC_MUTABLE_KEYS"
+    kv = _XCTC_TEMPLATE.copy()
+    kv['aggregateStatisticsBeforeCrash'] = {'XCSuiteRecordsKey': {}}
+    kv['targetApplicationArguments'] = []
+    kv['testApplicationDependencies'] = {}
+    return kv
+
+
+class XCTestConfiguration:
     def __init__(self, kv: dict):
         # self._kv = kv
         assert 'testBundleURL' in kv and isinstance(kv['testBundleURL'], NSURL)
         assert 'sessionIdentifier' in kv and isinstance(
             kv['sessionIdentifier'], uuid.UUID)
 
-        self._kv = copy.deepcopy(self._default)
+        self._kv = _clone_default()
         self._kv.update(kv)
 
     def __str__(self):
@@ -703,8 +773,9 @@ class XCTestConfiguration:
         self._kv[key] = val
 
     def encode_archive(objects, archive):
+        encode = archive.encode
         for (k, v) in objects._kv.items():
-            archive.encode(k, v)
+            encode(k, v)
 
     # def decode(objects: list, archive: dict):
     #     # info = ns_info.copy()
@@ -716,31 +787,53 @@ class XCTestConfiguration:
     #     return XCTestConfiguration()
 
 
-class XCActivityRecord(dict):
-    _keys = ('activityType', 'attachments', 'finish', 'start', 'title', 'uuid')
+@_dataclass
+class XCActivityRecord(collections.abc.Mapping):
+    # declared by hand rather than via dataclass(slots=True) to stay 3.7 compatible
+    __slots__ = ('activityType', 'attachments', 'finish', 'start', 'title', 'uuid')
+    activityType: object
+    attachments: object
+    finish: object
+    start: object
+    title: object
+    uuid: object
 
     def __repr__(self):
-        attrs = []
-        for key in self._keys:
-            attrs.append('{}={}'.format(key, self[key]))
+        return 'XCActivityRecord({})'.format(
+            ', '.join(['{}={}'.format(k, getattr(self, k)) for k in self.__slots__]))
 
-        return 'XCActivityRecord({})'.format(', '.join(attrs))
+    # Records used to be dicts; Mapping provides the rest of the read-only API
+    def __getitem__(self, key):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
 
-    def decode_archive(archive):
-        ret = XCActivityRecord()
-        for key in XCActivityRecord._keys:
-            ret[key] = archive.decode(key)
-        return ret
+    def __iter__(self):
+        return iter(self.__slots__)
+
+    def __len__(self):
+        return len(self.__slots__)
+
+    @classmethod
+    def decode_archive(cls, archive):
+        decode = archive.decode
+        return cls(decode('activityType'), decode('attachments'),
+                   decode('finish'), decode('start'), decode('title'),
+                   decode('uuid'))
+
+
+# Getter behind the uuid.UUID.bytes property, called without the property
+_UUID_BYTES_GET = uuid.UUID.bytes.fget
 
 
 class NSUUID(uuid.UUID):
     def encode_archive(objects, archive):
-        archive._archive_obj["NS.uuidbytes"] = objects.bytes
+        archive._archive_obj[_NS_UUIDBYTES] = _UUID_BYTES_GET(objects)
         # archive.encode("NS.uuidbytes", objects.bytes)
 
     def decode_archive(archive):
-        uuidbytes = archive.decode('NS.uuidbytes')
-        return NSUUID(bytes=bytes(uuidbytes))
+        uuidbytes = archive.decode(_NS_UUIDBYTES)
+        return NSUUID(bytes=uuidbytes if type(uuidbytes) is bytes else bytes(uuidbytes))
 
 class DTKTraceTapMessage:
     def decode_archive(archive):
@@ -754,14 +847,14 @@ class MutableDataArchive:
     "Delegate for packing/unpacking NSMutableData objects"
 
     def decode_archive(archive):
-        s = archive.decode('NS.data')
+        s = archive.decode(_NS_DATA)
         return s
 
 class MutableStringArchive:
     "Delegate for packing/unpacking NSMutableString objects"
 
     def decode_archive(archive):
-        s = archive.decode('NS.string')
+        s = archive.decode(_NS_STRING)
         return s
 
 UNARCHIVE_CLASS_MAP = {
@@ -84,7 +84,7 @@ class UID:
         return self.data
 
     def __repr__(self):
-        return "%s(%s)" % (self.__class__.__name__, repr(self.data))
+        return "%s(%d)" % (self.__class__.__name__, self.data)
 
     def __reduce__(self):
         return self.__class__, (self.data,)